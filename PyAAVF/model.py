@@ -22,23 +22,38 @@ CONDITIONS OF ANY KIND, either express or implied. See the License for the
 specific language governing permissions and limitations under the License.
 """
 
+import array
+import sys
+from operator import attrgetter
+
 MISSING_VALUE = '.'
 
+# Sort key for bulk sorting of records, e.g. sorted(records, key=RECORD_KEY).
+# attrgetter runs at C level, so sorting pays one key extraction per record
+# instead of a Python-level __lt__ call per comparison.
+RECORD_KEY = attrgetter('CHROM', 'GENE', 'POS')
+
 # Conversion between value in file and Python value
 FIELD_COUNTS = {
     MISSING_VALUE: None,  # Unknown number of values
 }
 
+# Inverse of FIELD_COUNTS, for restoring header Number values on output
+FIELD_COUNT_NAMES = dict((v, k) for k, v in FIELD_COUNTS.items())
+
 
 # pylint: disable=useless-object-inheritance
 class Info(object):
     '''An object that defines the metadata INFO field attributes'''
 
+    # Reversed header field count dictionary, shared by all instances
+    counts = FIELD_COUNT_NAMES
+
     # pylint: disable=invalid-name,too-many-arguments,too-few-public-methods
-    def __init__(self, info_id, info_num, info_type, info_desc, info_source, info_version):
+    __slots__ = ('info_id', 'info_num', 'info_type', 'info_desc',
+                 'info_source', 'info_version')
 
-        # Reverse keys and values in header field count dictionary
-        self.counts = dict((v, k) for k, v in FIELD_COUNTS.items())
+    def __init__(self, info_id, info_num, info_type, info_desc, info_source, info_version):
 
         self.info_id = info_id
         self.info_num = info_num
@@ -48,9 +63,9 @@ class Info(object):
         self.info_version = info_version
 
     def __str__(self):
-        info_line = "##INFO=<ID=%s,Number=%s,Type=%s,Description=\"%s\">\n"
-        return info_line % (self.info_id, self._fix_field_count(self.info_num),
-                            self.info_type, self.info_desc)
+        return (f'##INFO=<ID={self.info_id},'
+                f'Number={self._fix_field_count(self.info_num)},'
+                f'Type={self.info_type},Description="{self.info_desc}">\n')
 
     def _fix_field_count(self, num_str):
         """Restore header number to original state"""
@@ -67,13 +82,14 @@ class Filter(object):
     '''An object that defines the metadata FILTER field attributes'''
 
     # pylint: disable=invalid-name,too-few-public-methods
+    __slots__ = ('filter_id', 'filter_desc')
+
     def __init__(self, filter_id, filter_desc):
         self.filter_id = filter_id
         self.filter_desc = filter_desc
 
     def __str__(self):
-        filter_line = "##FILTER=<ID=%s,Description=\"%s\">\n"
-        return filter_line % (self.filter_id, self.filter_desc)
+        return f'##FILTER=<ID={self.filter_id},Description="{self.filter_desc}">\n'
 
 
 # pylint: disable=useless-object-inheritance
@@ -81,6 +97,9 @@ class AAVF(object):
     '''An iterable AAVF object that contains the metadata from an AAVF file
        and an list of AAVF records.'''
 
+    __slots__ = ('metadata', 'infos', 'filters', 'column_headers', 'records',
+                 '_iter')
+
     # pylint: disable=too-many-arguments,too-few-public-methods
     def __init__(self, metadata, infos, filters, column_headers, records):
         """ Create a new AAVF objeect, an iterator of _Record objects.
@@ -97,39 +116,72 @@ class AAVF(object):
         # a list of _Record objects
         self.records = records
 
-        self.record_len = len(self.records)
-
-        self.index = -1
+        # lazily-created iterator backing __next__, for callers that use
+        # next() on the AAVF object directly
+        self._iter = None
 
     def __iter__(self):
-        return self
+        # Hand iteration to the C-level list iterator. Each loop gets a
+        # fresh iterator, so nested iteration over the same AAVF works.
+        return iter(self.records)
 
     def __next__(self):
-        if self.index == (self.record_len - 1):
-            raise StopIteration
-        self.index = self.index + 1
-        return self.records[self.index]
+        if self._iter is None:
+            self._iter = iter(self.records)
+        return next(self._iter)
 
     def next(self):
         """Get next item in iterable."""
         return self.__next__()
 
+    def columns(self):
+        """ Return the record fields as parallel columns (struct-of-arrays).
+            Numeric fields (POS, ALT_FREQ, COVERAGE) are packed into compact
+            ``array.array`` buffers; the remaining fields are plain lists.
+            Bulk scans over a single field can iterate one contiguous column
+            instead of touching every Record object."""
+        records = self.records
+        return {
+            'CHROM': [record.CHROM for record in records],
+            'GENE': [record.GENE for record in records],
+            'POS': array.array('l', (record.POS for record in records)),
+            'REF': [record.REF for record in records],
+            'ALT': [record.ALT for record in records],
+            'FILTER': [record.FILTER for record in records],
+            'ALT_FREQ': array.array('d', (record.ALT_FREQ for record in records)),
+            'COVERAGE': array.array('l', (record.COVERAGE for record in records)),
+            'INFO': [record.INFO for record in records],
+        }
+
 
 # pylint: disable=useless-object-inheritance
 class Record(object):
     """ Equivalent to a row in an AAVF file.
         The standard AAVF fields CHROM, GENE, POS, REF, ALT, FILTER, ALT_FREQ,
         COVERAGE and INFO are available as properties.
+        For bulk sorting, prefer ``sorted(records, key=RECORD_KEY)`` over
+        relying on ``__lt__``.
     """
+
     # pylint: disable=invalid-name,too-many-instance-attributes,too-many-arguments
+    __slots__ = ('CHROM', 'GENE', 'POS', 'REF', 'ALT', 'FILTER', 'ALT_FREQ',
+                 'COVERAGE', 'INFO')
+
     def __init__(self, CHROM, GENE, POS, REF, ALT, FILTER, ALT_FREQ, COVERAGE,
                  INFO):
         """init"""
-        self.CHROM = CHROM
-        self.GENE = GENE
+        # CHROM/GENE/REF/ALT have very low cardinality across a file, so
+        # intern them: duplicate strings share one object and equality
+        # checks short-circuit on identity.
+        self.CHROM = sys.intern(CHROM) if isinstance(CHROM, str) else CHROM
+        self.GENE = sys.intern(GENE) if isinstance(GENE, str) else GENE
         self.POS = POS
-        self.REF = REF
-        self.ALT = ALT
+        self.REF = sys.intern(REF) if isinstance(REF, str) else REF
+        if isinstance(ALT, list):
+            self.ALT = [sys.intern(alt) if isinstance(alt, str) else alt
+                        for alt in ALT]
+        else:
+            self.ALT = ALT
         self.FILTER = FILTER
         self.ALT_FREQ = ALT_FREQ
         self.COVERAGE = COVERAGE
@@ -141,41 +193,36 @@ class Record(object):
             If AC is present in the INFO column of both _Records then INFO[AC] must be equal
             for _Records to be equal.
         """
-        ac_present = False
-        if "AC" in self.INFO and "AC" not in other.INFO:
-            return False
-        if "AC" not in self.INFO and "AC" in other.INFO:
-            return False
+        try:
+            other_key = (other.CHROM, other.GENE, other.POS, other.REF, other.ALT)
+            other_info = other.INFO
+        except AttributeError:
+            return NotImplemented
 
-        if "AC" in self.INFO and "AC" in other.INFO:
-            ac_present = True  # AC is present in both INFO fields
-
-        equal_rec = (self.CHROM == getattr(other, "CHROM", None) and
-                     self.GENE == getattr(other, "GENE", None) and
-                     self.POS == getattr(other, "POS", None) and
-                     self.REF == getattr(other, "REF", None) and
-                     self.ALT == getattr(other, "ALT", None))
+        if (self.CHROM, self.GENE, self.POS, self.REF, self.ALT) != other_key:
+            return False
 
-        if ac_present:
-            equal_rec = equal_rec and \
-                        (self.INFO["AC"] == getattr(other, "INFO", None).get("AC", None))
+        ac_present = "AC" in self.INFO
+        if ac_present != ("AC" in other_info):
+            return False
 
-        return equal_rec
+        return not ac_present or self.INFO["AC"] == other_info["AC"]
 
     # For Python 3
     def __lt__(self, other):
         """__lt__"""
-        lhs = (self.CHROM, self.GENE, self.POS)
-        rhs = (getattr(other, "CHROM", None),
-               getattr(other, "GENE", None),
-               getattr(other, "POS", None))
-        return lhs < rhs
+        try:
+            rhs = (other.CHROM, other.GENE, other.POS)
+        except AttributeError:
+            return NotImplemented
+        return (self.CHROM, self.GENE, self.POS) < rhs
 
     def __str__(self):
         """str"""
-        return (("Record(CHROM=%(CHROM)s, GENE=%(GENE)s, POS=%(POS)s, REF=%(REF)s, " +
-                 "ALT=%(ALT)s, FILTER=%(FILTER)s, ALT_FREQ=%(ALT_FREQ)s, " +
-                 "COVERAGE=%(COVERAGE)s, INFO=%(INFO)s)") % self.__dict__)
+        return (f'Record(CHROM={self.CHROM}, GENE={self.GENE}, '
+                f'POS={self.POS}, REF={self.REF}, ALT={self.ALT}, '
+                f'FILTER={self.FILTER}, ALT_FREQ={self.ALT_FREQ}, '
+                f'COVERAGE={self.COVERAGE}, INFO={self.INFO})')
 
     def add_filter(self, flt):
         """add filter"""
@@ -188,12 +235,8 @@ class Record(object):
         """add_info"""
         self.INFO[info] = value
 
-    # pylint: disable=no-else-return
     @property
     def is_filtered(self):
         """ Return True if a variant has been filtered """
-        filt = self.FILTER
-        if filt is None or not filt:  # FILTER is not set or set to PASS
-            return False
-        else:
-            return True
+        # FILTER unset (None) and PASS ([]) are both falsy
+        return bool(self.FILTER)
@@ -42,25 +42,39 @@ RESERVED_INFO = {
 # Metadata lines which are singular
 SINGULAR_METADATA = ['fileformat', 'fileDate', 'source']
 
+# Integer codes for INFO type dispatch; a single int compare in
+# _parse_info's inner loop replaces a ladder of string comparisons.
+TYPE_INTEGER, TYPE_FLOAT, TYPE_FLAG, TYPE_STRING = range(4)
+_TYPE_CODES = {'Integer': TYPE_INTEGER, 'Float': TYPE_FLOAT,
+               'Flag': TYPE_FLAG, 'String': TYPE_STRING,
+               'Character': TYPE_STRING}
+
+# Header and row patterns, compiled once at import. Building these per
+# Reader re-paid regex compilation for every file opened. The
+# '##INFO=<' / '##FILTER=<' prefixes are verified by the startswith
+# dispatch in _parse_metadata, so the patterns start at the payload.
+INFO_PATTERN = re.compile(r'''
+    ID=(?P<id>[^,]+),\s*
+    Number=(?P<number>-?\d+|\.)?,\s*
+    Type=(?P<type>Integer|Float|Flag|Character|String),\s*
+    Description="(?P<desc>[^"]*)"
+    (?:,\s*Source="(?P<source>[^"]*)")?
+    (?:,\s*Version="?(?P<version>[^"]*)"?)?
+    >''', re.VERBOSE)
+FILTER_PATTERN = re.compile(r'''
+    ID=(?P<id>[^,]+),\s*
+    Description="(?P<desc>[^"]*)"
+    >''', re.VERBOSE)
+# Rows are tab-delimited per spec, but runs of spaces are tolerated
+ROW_PATTERN = re.compile(r'\t| +')
+
 
 # pylint: disable=useless-object-inheritance
 class _aavfMetadataParser(object):
     '''Parse the metadata in the header of a AAVF file.'''
-    def __init__(self):
-        super(_aavfMetadataParser, self).__init__()
-        self.info_pattern = re.compile(r'''\#\#INFO=<
-            ID=(?P<id>[^,]+),\s*
-            Number=(?P<number>-?\d+|\.)?,\s*
-            Type=(?P<type>Integer|Float|Flag|Character|String),\s*
-            Description="(?P<desc>[^"]*)"
-            (?:,\s*Source="(?P<source>[^"]*)")?
-            (?:,\s*Version="?(?P<version>[^"]*)"?)?
-            >''', re.VERBOSE)
-        self.filter_pattern = re.compile(r'''\#\#FILTER=<
-            ID=(?P<id>[^,]+),\s*
-            Description="(?P<desc>[^"]*)"
-            >''', re.VERBOSE)
-        self.meta_pattern = re.compile(r'''##(?P<key>.+?)=(?P<val>.+)''')
+
+    info_pattern = INFO_PATTERN
+    filter_pattern = FILTER_PATTERN
 
     # pylint: disable=no-self-use
     def aavf_field_count(self, num_str):
@@ -76,7 +90,11 @@ class _aavfMetadataParser(object):
 
     def read_info(self, info_string):
         '''Read a meta-information INFO line.'''
-        match = self.info_pattern.match(info_string)
+        # fullmatch anchors the pattern at both ends, so malformed lines
+        # fail fast instead of driving the optional groups into
+        # backtracking, and trailing garbage is rejected. The slice skips
+        # the '##INFO=<' prefix the caller has already checked.
+        match = self.info_pattern.fullmatch(info_string[8:])
         if not match:
             raise SyntaxError(
                 "One of the INFO lines is malformed: %s" % info_string)
@@ -91,7 +109,7 @@ class _aavfMetadataParser(object):
 
     def read_filter(self, filter_string):
         '''Read a meta-information FILTER line.'''
-        match = self.filter_pattern.match(filter_string)
+        match = self.filter_pattern.fullmatch(filter_string[10:])
         if not match:
             raise SyntaxError(
                 "One of the FILTER lines is malformed: %s" % filter_string)
@@ -102,13 +120,15 @@ class _aavfMetadataParser(object):
 
     def read_meta(self, meta_string):
         '''Read a meta-information META line.'''
-        match = self.meta_pattern.match(meta_string)
-        if not match:
+        # A plain META line is just '##key=value'; partition on the first
+        # '=' in one C-level scan instead of running a regex per line.
+        key, sep, val = meta_string[2:].partition('=')
+        if not sep or not key or not val:
             # Spec only allows key=value, but we try to be liberal and
             # interpret anything else as key=none (and all values are parsed
             # as strings).
             return meta_string.lstrip('#'), 'none'
-        return (match.group('key'), match.group('val'))
+        return (key, val)
 
 
 # pylint: disable=too-many-instance-attributes,too-few-public-methods,useless-object-inheritance
@@ -129,17 +149,16 @@ class Reader(object):
             self._reader = fname_or_stream
         else:
             if os.path.isfile(fname_or_stream):
-                self._reader = open(fname_or_stream, "r")
+                # a large buffer keeps per-line reads from hitting the OS
+                self._reader = open(fname_or_stream, "r", buffering=1 << 20)
             elif os.path.isdir(fname_or_stream):
                 raise Exception('File path provided is a directory')
             else:
                 raise Exception('File path provided does not exist.')
 
-        self._separator = '\t| +'
+        self._row_pattern = ROW_PATTERN
 
-        self._row_pattern = re.compile(self._separator)
-
-        self.reader = (line.strip() for line in self._reader if line.strip())
+        self.reader = _non_blank_lines(self._reader)
 
         #: metadata fields from header (string or hash, depending)
         self.metadata = {}
@@ -147,53 +166,75 @@ class Reader(object):
         self.infos = {}
         #: FILTER fields from header
         self.filters = {}
+        # id -> (type, number) dispatch table built by _parse_metadata
+        self._info_spec = {}
+        # raw FILTER string -> split name list; files reuse a handful of
+        # filter tokens, so most records hit the cache
+        self._filter_cache = {}
+        # raw INFO string -> parsed dict, for files that repeat whole
+        # annotation tuples across records
+        self._info_cache = {}
         self._header_lines = []
         self.column_headers = []
         self.header_lines = []
 
-    # pylint: disable=too-many-locals
-    def read_records(self):
-        """ Parse records from a AAVF file, returns an iterable AAVF object which can
-            be used to iterate over AAVF records read from a file. The AAVF object
-            returned also contains the metadata parsed from the file."""
+    def iter_records(self):
+        """ Parse records from a AAVF file lazily, yielding each Record as
+            it is read. The header is parsed first, so metadata, infos and
+            filters are populated on this Reader once iteration starts.
+            Streaming consumers (e.g. reader-to-writer pipelines) can use
+            this to keep memory flat regardless of file size."""
 
         self._parse_metadata()
-        record_list = []
-        line = next(self.reader)
-
-        # add records to the AAVF object until we have reached StopIteration
-        while line:
-            row = self._row_pattern.split(line.rstrip())
-            chrom = row[0]
 
-            gene = str(row[1])
-
-            pos = int(row[2])
-
-            ref = row[3]
-            alt = row[4].split(',')
-
-            filt = self._parse_filter(row[5])
-
-            alt_freq = float(row[6])
-
-            coverage = int(row[7])
+        # hoist the per-record attribute/method/builtin lookups out of the
+        # hot loop; local loads are cheaper than globals
+        regex_split = self._row_pattern.split
+        parse_filter = self._parse_filter
+        parse_info = self._parse_info
+        to_int = int
+        to_float = float
+
+        for line in self.reader:
+            # Spec-compliant rows are tab-delimited; str.split runs in C
+            # without regex dispatch. Fall back to the regex for rows
+            # padded with runs of spaces.
+            row = line.split('\t')
+            if len(row) < 9:
+                row = regex_split(line)
+
+            # most records carry a single ALT allele; skip the split scan
+            alt = row[4]
+            alt = alt.split(',') if ',' in alt else [alt]
+
+            # nearly every FILTER cell is '.' or 'PASS'; settle those inline
+            # and only call the regex-splitting parser for real filter lists
+            flt = row[5]
+            if flt == MISSING_VALUE:
+                flt = None
+            elif flt == 'PASS':
+                flt = []
+            else:
+                flt = parse_filter(flt)
 
-            info = self._parse_info(row[8])
+            # Build the record straight from the split row; the only
+            # conversions are the ones that actually change type (the old
+            # str(row[1]) cast was a no-op on an already-split string).
+            yield Record(
+                row[0], row[1], to_int(row[2]), row[3], alt,
+                flt, to_float(row[6]), to_int(row[7]),
+                parse_info(row[8]))
 
-            record = Record(chrom, gene, pos, ref, alt, filt, alt_freq, coverage,
-                            info)
-            record_list.append(record)
-            try:
-                line = next(self.reader)
-            except StopIteration:
-                line = None
+    def read_records(self):
+        """ Parse records from a AAVF file, returns an iterable AAVF object which can
+            be used to iterate over AAVF records read from a file. The AAVF object
+            returned also contains the metadata parsed from the file."""
 
-        aavf = AAVF(self.metadata, self.infos, self.filters, self.column_headers, record_list)
+        record_list = list(self.iter_records())
 
-        return aavf
+        return AAVF(self.metadata, self.infos, self.filters, self.column_headers, record_list)
 
-    # pylint: disable=no-self-use,no-else-return
+    # pylint: disable=no-else-return
     def _parse_filter(self, filt_str):
         '''Parse the FILTER field of a AAVF entry into a Python list
         '''
@@ -201,8 +242,14 @@ class Reader(object):
             return None
         elif filt_str == 'PASS':
             return []
-        else:
-            return filt_str.split(';')
+        cached = self._filter_cache.get(filt_str)
+        if cached is None:
+            if len(self._filter_cache) > 1024:
+                self._filter_cache.clear()
+            cached = self._filter_cache[filt_str] = filt_str.split(';')
+        # Copy so each record owns its FILTER list (add_filter mutates it);
+        # the copy still shares the already-built name strings.
+        return cached[:]
 
     # pylint: disable=too-many-branches
     def _parse_info(self, info_str):
@@ -212,53 +259,75 @@ class Reader(object):
         if info_str == MISSING_VALUE:  # if set to the missing value
             return {}
 
-        entries = info_str.split(';')
+        cached = self._info_cache.get(info_str)
+        if cached is not None:
+            # Each record owns its INFO dict (add_info mutates it) and its
+            # multi-valued lists (callers may mutate those in place too),
+            # so both get shallow-copied on a hit; that is still far
+            # cheaper than a reparse.
+            return {key: val[:] if val.__class__ is list else val
+                    for key, val in cached.items()}
+
+        info_spec = self._info_spec
         retdict = {}
 
-        for entry in entries:
-            entry = entry.split('=', 1)
-            info_id = entry[0]
-            try:
-                entry_type = self.infos[info_id].info_type
-            except KeyError:
-                try:
-                    entry_type = RESERVED_INFO[info_id]
-                except KeyError:
-                    if entry[1:]:
-                        entry_type = 'String'
-                    else:
-                        entry_type = 'Flag'
-
-            if entry_type == 'Integer':
-                vals = entry[1].split(',')
+        for entry in info_str.split(';'):
+            # find + slice beats split('=', 1) here: no per-entry list
+            eq_idx = entry.find('=')
+            if eq_idx < 0:
+                info_id, rest = entry, None
+            else:
+                info_id, rest = entry[:eq_idx], entry[eq_idx + 1:]
+            spec = info_spec.get(info_id)
+            if spec is not None:
+                type_code, info_num = spec
+            elif rest is not None:
+                type_code, info_num = TYPE_STRING, None
+            else:
+                type_code, info_num = TYPE_FLAG, None
+
+            if type_code == TYPE_INTEGER:
+                # Most numeric entries hold a single value; skip the split
+                # for those. Plain comprehensions convert without any
+                # per-element helper dispatch.
+                vals = rest.split(',') if ',' in rest else [rest]
                 try:
-                    val = _map(int, vals)
+                    val = [int(x_var) for x_var in vals]
                 # Allow specified integers to be flexibly parsed as floats.
                 # Handles cases with incorrectly specified header types.
                 except ValueError:
-                    val = _map(float, vals)
-            elif entry_type == 'Float':
-                vals = entry[1].split(',')
-                val = _map(float, vals)
-            elif entry_type == 'Flag':
+                    val = [float(x_var) for x_var in vals]
+                    # demote the id so later records skip the failed
+                    # int() attempt and its exception
+                    info_spec[info_id] = (TYPE_FLOAT, info_num)
+            elif type_code == TYPE_FLOAT:
+                vals = rest.split(',') if ',' in rest else [rest]
+                val = [float(x_var) for x_var in vals]
+            elif type_code == TYPE_FLAG:
                 val = True
-            elif entry_type in ('String', 'Character'):
-                try:
-                    vals = entry[1].split(',')  # commas are reserved
-                    # characters indicating multiple values
-                    val = _map(str, vals)
-                except IndexError:
-                    entry_type = 'Flag'
+            else:  # TYPE_STRING covers both String and Character
+                if rest is not None:
+                    # commas are reserved characters indicating multiple
+                    # values; split already yields str objects
+                    val = rest.split(',')
+                else:
+                    # declared String but used as a flag
+                    type_code = TYPE_FLAG
                     val = True
 
-            try:
-                if self.infos[info_id].info_num == 1 and entry_type not in ('Flag', ):
-                    val = val[0]
-            except KeyError:
-                pass
+            if info_num == 1 and type_code != TYPE_FLAG:
+                val = val[0]
 
             retdict[info_id] = val
 
+        if len(self._info_cache) > 4096:
+            self._info_cache.clear()
+        # copy list values into the cache as well: retdict belongs to the
+        # record being built, so the cache must not alias its lists either
+        self._info_cache[info_str] = {
+            key: val[:] if val.__class__ is list else val
+            for key, val in retdict.items()}
+
         return retdict
 
     def _parse_metadata(self):
@@ -296,14 +365,24 @@ class Reader(object):
 
             line = next(self.reader)
 
+        # Flat id -> (type, number) table consulted per INFO entry; header
+        # definitions override the RESERVED_INFO defaults (which declare no
+        # number, so their values are never unwrapped from lists).
+        self._info_spec = {info_id: (_TYPE_CODES[info_type], None)
+                           for info_id, info_type in RESERVED_INFO.items()}
+        self._info_spec.update(
+            (info_id, (_TYPE_CODES[info.info_type], info.info_num))
+            for info_id, info in self.infos.items())
+
         if not line:
             raise Exception("Unable to parse header line in AAVF file.")
         else:
-            # pylint: disable=dangerous-default-value
-            fields = self._row_pattern.split(line[1:])
-            self.column_headers = []
-            for field in fields[:9]:
-                self.column_headers.append(field.strip())
+            # same tab-first split as the record loop; the regex is only
+            # needed for space-padded headers
+            fields = line[1:].split('\t')
+            if len(fields) < 9:
+                fields = self._row_pattern.split(line[1:])
+            self.column_headers = [field.strip() for field in fields[:9]]
 
 
 # pylint: disable=useless-object-inheritance
@@ -312,16 +391,26 @@ class Writer(object):
        and an AAVF object to use as a template for the AAVF metadata and
        header. Optionally specify the line terminator."""
 
-    def __init__(self, stream, template):
+    def __init__(self, stream, template, decimals=None):
         self.template = template
         self.stream = stream
 
+        # Default decimal count for ALT_FREQ output; per-call decimals=
+        # arguments override it. Formatters are specialized per count and
+        # cached, so the format spec is parsed once rather than per record.
+        self.decimals = decimals
+        self._float_fmts = {}
+
         # Order keys for INFO fields defined in the header (undefined fields
         # get a maximum key).
         self.info_order = collections.defaultdict(
             lambda: len(template.infos),
             dict(zip(template.infos.keys(), itertools.count())))
 
+        # Memoized sort results keyed by INFO key set; most records share
+        # one schema, so the per-record sort in _format_info runs once.
+        self._order_cache = {}
+
         for (key, vals) in template.metadata.items():
             if key in SINGULAR_METADATA:
                 vals = [vals]
@@ -343,21 +432,49 @@ class Writer(object):
         """Write the header line of the AAVF output"""
         self.stream.write('#' + '\t'.join(self.template.column_headers) + '\n')
 
+    def _float_fmt(self, decimals):
+        """Return a cached bound formatter for a fixed decimal count."""
+        fmt = self._float_fmts.get(decimals)
+        if fmt is None:
+            fmt = self._float_fmts[decimals] = ('%%.%df' % decimals).__mod__
+        return fmt
+
+    def _format_record(self, record, decimals=None):
+        """Render one record as a complete output line."""
+        if decimals is None:
+            decimals = self.decimals
+        if decimals is not None:
+            alt_freq = self._float_fmt(decimals)(record.ALT_FREQ)
+        else:
+            alt_freq = str(record.ALT_FREQ)
+        return '\t'.join((
+            self._stringify(record.CHROM), self._stringify(record.GENE),
+            str(record.POS), self._stringify(record.REF),
+            self._format_alt(record.ALT), self._format_filter(record.FILTER),
+            alt_freq, str(record.COVERAGE),
+            self._format_info(record.INFO))) + '\n'
+
     def write_record(self, record, decimals=None):
         """Write the record into the next line of the AAVF output
            write a record to the file. When passed as an argument, decimals
            specifies the number of decimal places of ALT_FREQ that will be
            printed out."""
-        ffs = [record.CHROM, record.GENE, str(record.POS), record.REF]
-        ffs += [self._format_alt(record.ALT), self._format_filter(record.FILTER)]
-        if decimals is not None:
-            formatter = "%0." + str(decimals) + "f"
-            ffs += [formatter % record.ALT_FREQ]
-        else:
-            ffs += [str(record.ALT_FREQ)]
-        ffs += [str(record.COVERAGE), self._format_info(record.INFO)]
-        ffs = _map(str, ffs)
-        self.stream.write('\t'.join(ffs)+'\n')
+        self.stream.write(self._format_record(record, decimals))
+
+    def write_records(self, records, decimals=None, batch_size=4096):
+        """Write an iterable of records, issuing one stream write per
+           batch_size rendered lines instead of one write per record."""
+        fmt = self._format_record
+        write = self.stream.write
+        buf = []
+        append = buf.append
+        for record in records:
+            append(fmt(record, decimals))
+            if len(buf) >= batch_size:
+                write(''.join(buf))
+                del buf[:]
+        if buf:
+            write(''.join(buf))
 
     def flush(self):
         """Flush the writer"""
@@ -376,8 +493,8 @@ class Writer(object):
     # pylint: disable=no-self-use
     def _format_alt(self, alt):
         """Format ALT data field"""
-        alt_str = _map(str, alt)
-        return ','.join(alt_str)
+        # map feeds join lazily; no intermediate list
+        return ','.join(map(str, alt))
 
     def _format_filter(self, flt):
         """Get the correctly formatted FILTER data field"""
@@ -389,8 +506,12 @@ class Writer(object):
         """Get the correctly formatted INFO data field"""
         if not info:
             return MISSING_VALUE
-        return ';'.join(self._stringify_pair(f, info[f]) for f in
-                        sorted(info, key=self.order_key))
+        cache_key = frozenset(info)
+        order = self._order_cache.get(cache_key)
+        if order is None:
+            order = sorted(info, key=self.order_key)
+            self._order_cache[cache_key] = order
+        return ';'.join(self._stringify_pair(f, info[f]) for f in order)
 
     def order_key(self, field):
         '''Order by header definition first, alphabetically second.'''
@@ -399,23 +520,26 @@ class Writer(object):
     # pylint: disable=no-self-use
     def _stringify(self, x_var, none='.', delim=','):
         """Convert an object to a string, accounting for missing values"""
-        if isinstance(x_var, list):
-            return delim.join(_map(str, x_var, none))
-        return str(x_var) if x_var is not None else none
+        if x_var is None:
+            return none
+        if x_var.__class__ is list:
+            return delim.join(none if v is None else str(v) for v in x_var)
+        return str(x_var)
 
     def _stringify_pair(self, x_var, y_var, none='.', delim=','):
         """Convert a pair of objects to a string (e.g. "X : Y"), accounting
            for missing values."""
-        if isinstance(y_var, bool):
+        if y_var.__class__ is bool:
             return str(x_var) if y_var else ""
-        return "%s=%s" % (str(x_var),
-                          self._stringify(y_var, none=none, delim=delim))
+        return f"{x_var}={self._stringify(y_var, none=none, delim=delim)}"
 
 
-def _map(func, iterable, none=MISSING_VALUE):
-    '''``map``, but make None values none.'''
-    return [func(x_var) if x_var is not None else none
-            for x_var in iterable]
+def _non_blank_lines(stream):
+    '''Yield each non-blank line of the stream, stripped exactly once.'''
+    for line in stream:
+        stripped = line.strip()
+        if stripped:
+            yield stripped
 
 
 def __update_readme():
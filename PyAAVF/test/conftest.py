@@ -0,0 +1,48 @@
+"""
+Copyright Government of Canada 2018
+
+Modified by: Matthew Fogel, National Microbiology Laboratory,
+             Public Health Agency of Canada
+
+Licensed under the Apache License, Version 2.0 (the "License"); you may not use
+this work except in compliance with the License. You may obtain a copy of the
+License at:
+
+http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software distributed
+under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR
+CONDITIONS OF ANY KIND, either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+"""
+
+import copy
+import os
+
+import pytest
+
+import PyAAVF.parser as parser
+
+TEST_PATH = os.path.dirname(os.path.abspath(__file__))
+SAMPLE_FILE = os.path.join(TEST_PATH, 'sample.aavf')
+
+
+@pytest.fixture(scope='session')
+def _sample_template():
+    """Parse sample.aavf once per test session. Tests never see this
+       object directly; they get independent deep copies so mutations
+       in one test cannot leak into another."""
+    return parser.Reader(SAMPLE_FILE).read_records()
+
+
+@pytest.fixture
+def make_sample_aavf(_sample_template):
+    """Factory returning a fresh, independent copy of the parsed sample
+       file. Use this when a test needs more than one AAVF object."""
+    return lambda: copy.deepcopy(_sample_template)
+
+
+@pytest.fixture
+def sample_aavf(make_sample_aavf):
+    """An independent parsed copy of sample.aavf."""
+    return make_sample_aavf()
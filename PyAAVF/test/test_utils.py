@@ -27,7 +27,7 @@ import PyAAVF.parser as parser
 import PyAAVF.utils as utils
 
 TEST_PATH = os.path.dirname(os.path.abspath(__file__))
-SAMPLE_FILE = TEST_PATH + '/sample.aavf'
+SAMPLE_FILE = os.path.join(TEST_PATH, 'sample.aavf')
 
 # pylint: disable=no-self-use
 class TestUtils(object):
@@ -35,19 +35,15 @@ class TestUtils(object):
     Utilities for AAVF files.
     """
 
-    def fhandle(self, fname, mode='rt'):
-        """Return an open file handle."""
-        return open(os.path.join(os.path.dirname(__file__), fname), mode)
-
-    def test_walk(self):
+    def test_walk(self, make_sample_aavf):
         """
         Walk through three readers simultaneously and make sure that the
         output is identical.
         """
         # easy case: all same sites
-        aavf1 = parser.Reader(SAMPLE_FILE).read_records()
-        aavf2 = parser.Reader(SAMPLE_FILE).read_records()
-        aavf3 = parser.Reader(SAMPLE_FILE).read_records()
+        aavf1 = make_sample_aavf()
+        aavf2 = make_sample_aavf()
+        aavf3 = make_sample_aavf()
 
         number = 0
         for trio in utils.walk_together(aavf1, aavf2, aavf3):
@@ -56,3 +52,38 @@ class TestUtils(object):
             assert trio[1] == trio[2]
             number += 1
         assert number == 7
+
+    def test_walk_divergent_sites(self, make_sample_aavf):
+        """
+        Walk two readers whose sites only partly overlap: matching
+        records must line up in one row and sites missing from a reader
+        must come back as None, including once the shorter reader has
+        been exhausted.
+        """
+        records = list(make_sample_aavf())
+        # the second reader skips the first, a middle and the last site,
+        # so the walk diverges, reconverges and ends with one live reader
+        present = (1, 2, 4, 5)
+        subset = [record for i, record in enumerate(make_sample_aavf())
+                  if i in present]
+
+        rows = list(utils.walk_together(iter(records), iter(subset)))
+
+        assert len(rows) == len(records)
+        # the default yields an independent list per position
+        assert len(set(map(id, rows))) == len(rows)
+        for index, (left, right) in enumerate(rows):
+            assert left == records[index]
+            if index in present:
+                assert right == records[index]
+            else:
+                assert right is None
+
+        # reuse_buffer=True re-yields one list whose contents change
+        walker = utils.walk_together(iter(records), iter(subset),
+                                     reuse_buffer=True)
+        first = next(walker)
+        assert first[0] == records[0] and first[1] is None
+        for index, row in enumerate(walker, 1):
+            assert row is first
+            assert row[0] == records[index]
@@ -24,8 +24,13 @@ specific language governing permissions and limitations under the License.
 
 # Utilities for AAVF files.
 
+import heapq
 
-def walk_together(*readers):
+from PyAAVF.model import RECORD_KEY
+
+
+# pylint: disable=too-many-branches
+def walk_together(*readers, reuse_buffer=False):
     """
     Simultaneously iteratate over two or more AAVF readers. For each
     genomic position with a variant, return a list of size equal to the number
@@ -35,6 +40,10 @@ def walk_together(*readers):
     same reference otherwise behaviour is undefined.
     Two variants are considered to be equal if they have the same CHROM, GENE,
     POS, REF, and ALT values.
+    With reuse_buffer=True the same output list is yielded every iteration
+    (only its contents change), skipping one list copy per position; the
+    caller must then consume each row before advancing and must not retain
+    it.
     """
 
     nexts = []
@@ -44,30 +53,74 @@ def walk_together(*readers):
         except StopIteration:
             nexts.append(None)
 
-    min_k = (None,)   # keep track of the previous min key's contig
+    total = len(nexts)
 
-    # loop for each record being read by a reader
-    while any([reader is not None for reader in nexts]):
-        next_index_to_key = dict(
-            (index, (r.CHROM, r.GENE, r.POS)) for index, r in enumerate(nexts) if r is not None)
+    # heap of (key, reader index); the smallest key is always at the root,
+    # so selecting the next position is O(log k) per step instead of a
+    # linear rescan of every live reader
+    heap = [(RECORD_KEY(record), index)
+            for index, record in enumerate(nexts) if record is not None]
+    heapq.heapify(heap)
 
-        # key below refers to the values returned by _get_key()
-        # only add tuple to list if its key's CHROM values is the same as the
-        # CHROM value for the previous min key's contig
-        keys_with_prev_contig = [
-            key for key in next_index_to_key.values() if key[0] == min_k[0]]
+    # reusable output template: only the slots for the tied readers are
+    # written and reset each step, rather than rebuilding a k-slot list
+    # with a membership test per slot
+    output = [None] * total
 
-        if any(keys_with_prev_contig):
-            min_k = min(keys_with_prev_contig)   # finish previous contig
-        else:
-            min_k = min(next_index_to_key.values())   # move on to next contig
+    # loop for each record being read by a reader
+    while heap:
+        min_k = heap[0][0]
+
+        # pop every reader tied for the minimum key
+        min_k_idxs = []
+        while heap and heap[0][0] == min_k:
+            min_k_idxs.append(heapq.heappop(heap)[1])
+
+        if not heap:
+            # lockstep fast path: every live reader is tied, so runs of
+            # identical keys can be emitted without any heap traffic
+            while min_k_idxs:
+                for i in min_k_idxs:
+                    output[i] = nexts[i]
+                # by default yield a shallow copy so the caller may retain
+                # the list
+                yield output if reuse_buffer else output[:]
+                for i in min_k_idxs:
+                    output[i] = None
+
+                advanced = []
+                for i in min_k_idxs:
+                    try:
+                        record = next(readers[i])
+                    except StopIteration:
+                        nexts[i] = None
+                    else:
+                        nexts[i] = record
+                        advanced.append((RECORD_KEY(record), i))
+
+                if advanced and all(key == advanced[0][0]
+                                    for key, _ in advanced):
+                    # still in lockstep (exhausted readers drop out)
+                    min_k_idxs = [i for _, i in advanced]
+                else:
+                    # keys diverged; hand the live readers back to the heap
+                    for entry in advanced:
+                        heapq.heappush(heap, entry)
+                    min_k_idxs = []
+            continue
 
-        # pylint: disable=consider-using-set-comprehension
-        min_k_idxs = set([i for i, k in next_index_to_key.items() if k == min_k])
-        yield [nexts[i] if i in min_k_idxs else None for i in range(len(nexts))]
+        for i in min_k_idxs:
+            output[i] = nexts[i]
+        # by default yield a shallow copy so the caller may retain the list
+        yield output if reuse_buffer else output[:]
+        for i in min_k_idxs:
+            output[i] = None
 
         for i in min_k_idxs:
             try:
-                nexts[i] = next(readers[i])
+                record = next(readers[i])
             except StopIteration:
                 nexts[i] = None
+            else:
+                nexts[i] = record
+                heapq.heappush(heap, (RECORD_KEY(record), i))
@@ -1,9 +1,5 @@
-from setuptools import setup
-
 from setuptools import find_packages, setup
 
-DEPENDENCIES = ['setuptools']
-
 setup(
     name='PyAAVF',
     version='0.1.0',
@@ -13,13 +9,9 @@ setup(
     license='Apache License, Version 2.0',
     author='Matthew Fogel',
     author_email='matthew.fogel@canada.ca',
-    install_requires=DEPENDENCIES,
-    tests_require=(),
     description='An Amino Acid Variant Format parser for Python.',
-    entry_points='',
     classifiers=[
-        'License :: OSI Approved :: MIT License',
-        'Programming Language :: Python :: 2',
+        'License :: OSI Approved :: Apache Software License',
         'Programming Language :: Python :: 3',
     ]
 )
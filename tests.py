@@ -28,14 +28,11 @@ def run_static_analysis():
 
 
 def run_unit_tests():
-    run(('nosetests',
-         '--exe',
-         '--with-doctest',
-         '--doctest-options', '+NORMALIZE_WHITESPACE',
-         '--with-coverage',
-         '--cover-tests',
-         '--cover-inclusive',
-         '--cover-package', PACKAGE_DIR,
+    run(('pytest',
+         '--doctest-modules',
+         '-o', 'doctest_optionflags=NORMALIZE_WHITESPACE',
+         '--cov', PACKAGE_DIR,
+         '--cov-report', 'term',
          PACKAGE_DIR))
 
 